@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Build the ZCTA centroid cache used by the map scripts
+The shapefile parse is the heavy step, so it runs once here and the maps
+only read the small parquet afterwards
+"""
+import importlib.util
+import pandas as pd
+from pathlib import Path
+
+RESOURCES_DIR = Path(__file__).parent.parent / "resources"
+SHAPEFILE = RESOURCES_DIR / "shapefiles" / "cb_2020_us_zcta520_500k.shp"
+CENTROIDS_CACHE = RESOURCES_DIR / "shapefiles" / "zcta_centroids.parquet"
+
+def build_centroids_cache(shapefile=SHAPEFILE, cache=CENTROIDS_CACHE):
+    """Compute ZCTA centroids from the shapefile and write them to the parquet cache"""
+    # Imported here so the map scripts only pay for geopandas on a rebuild
+    import geopandas as gpd
+    import shapely
+    from pyproj import Transformer
+    if importlib.util.find_spec('pyogrio'):
+        # Vectorized GDAL read of just the ZIP column and geometry
+        gdf = gpd.read_file(shapefile, engine='pyogrio', use_arrow=True, columns=['ZCTA5CE20'])
+    else:
+        # Fiona reads every attribute, so keep only what the centroids need
+        gdf = gpd.read_file(shapefile, engine='fiona')[['ZCTA5CE20', 'geometry']]
+
+    # Get centroids in an equal-area projection (one vectorized GEOS call) as a
+    # single (N, 2) coordinate buffer, then bring them back to lat/lon
+    projected = gdf.geometry.to_crs('EPSG:5070')
+    xy = shapely.get_coordinates(shapely.centroid(projected.to_numpy()))
+    to_wgs84 = Transformer.from_crs('EPSG:5070', 'EPSG:4326', always_xy=True)
+    lon, lat = to_wgs84.transform(xy[:, 0], xy[:, 1])
+
+    centroids = pd.DataFrame({'ZCTA5CE20': gdf['ZCTA5CE20'].to_numpy(), 'lat': lat, 'lon': lon})
+    centroids.to_parquet(cache, index=False)
+    return centroids
+
+def load_centroids(shapefile=SHAPEFILE, cache=CENTROIDS_CACHE):
+    """Load ZCTA centroids from the cache, rebuilding it if the shapefile is newer"""
+    shapefile, cache = Path(shapefile), Path(cache)
+    if cache.exists() and cache.stat().st_mtime > shapefile.stat().st_mtime:
+        return pd.read_parquet(cache)
+
+    print("⚙️  Centroid cache missing or stale, rebuilding from shapefile...")
+    return build_centroids_cache(shapefile, cache)
+
+def main():
+    """Main function"""
+    if not SHAPEFILE.exists():
+        print(f"✗ Shapefile not found at {SHAPEFILE}")
+        return 1
+
+    print("📍 Building ZCTA centroid cache...")
+    centroids = build_centroids_cache()
+    print(f"✓ Cached {len(centroids):,} centroids to {CENTROIDS_CACHE}")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Build the simplified US state boundaries served next to ProMap.html
+The outlines are fetched once and simplified here, so the page loads a small
+same-origin file instead of the full GeoJSON from a third-party repo
+"""
+import json
+import requests
+from pathlib import Path
+
+STATES_URL = "https://raw.githubusercontent.com/PublicaMundi/MappingAPI/master/data/geojson/us-states.json"
+RESOURCES_DIR = Path(__file__).parent.parent / "resources"
+STATE_BOUNDARIES = RESOURCES_DIR / "us-states.min.geojson"
+SIMPLIFY_TOLERANCE = 0.01  # degrees, ~1 km; finer than a state outline shows at map zooms
+COORDINATE_DECIMALS = 4
+
+def build_state_boundaries(url=STATES_URL, output=STATE_BOUNDARIES):
+    """Download the state outlines, simplify them and write the compact GeoJSON"""
+    # Imported here so only a rebuild pays for shapely
+    import numpy as np
+    import shapely
+    from shapely.geometry import shape, mapping
+
+    response = requests.get(url, timeout=60)
+    response.raise_for_status()
+    states = response.json()
+
+    # Simplify each outline and round the coordinates, keeping only the state name
+    for feature in states['features']:
+        geometry = shapely.simplify(shape(feature['geometry']), SIMPLIFY_TOLERANCE, preserve_topology=True)
+        geometry = shapely.transform(geometry, lambda xy: np.round(xy, COORDINATE_DECIMALS))
+        feature['geometry'] = mapping(geometry)
+        feature['properties'] = {'name': feature['properties'].get('name')}
+
+    output.write_text(json.dumps(states, separators=(',', ':')))
+    return states
+
+def main():
+    """Main function"""
+    print("🗺️ Building simplified state boundaries...")
+    try:
+        states = build_state_boundaries()
+    except Exception as e:
+        print(f"✗ Error building state boundaries: {e}")
+        return 1
+
+    print(f"✓ Wrote {len(states['features'])} states to {STATE_BOUNDARIES} "
+          f"({STATE_BOUNDARIES.stat().st_size/1024:.0f} KB)")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
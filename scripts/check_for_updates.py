@@ -10,16 +10,56 @@ from pathlib import Path
 
 ZILLOW_URL = "https://files.zillowstatic.com/research/public_csvs/zhvi/Zip_zhvi_uc_sfrcondo_tier_0.33_0.67_sm_sa_month.csv"
 METADATA_FILE = Path(__file__).parent.parent / "data" / "last_update.json"
+HEADER_BYTES = 8192  # header row is ~4 KB: ~9 ID columns + one per month
+
+def get_latest_date_from_zillow(stored=None):
+    """Fetch just the header row to check the latest date column
+
+    The ETag/Last-Modified validators cached in ``stored`` are checked against
+    a HEAD request and replayed as a conditional GET, so an unchanged file
+    returns the cached date without transferring any of the CSV.
+    Returns (date_str, date, validators).
+    """
+    stored = stored or {}
+    cached_date_str = stored.get('last_date')
+
+    # HEAD is a few hundred bytes and tells us whether the file changed; it's
+    # only a shortcut, so a server that rejects it falls through to the GET
+    try:
+        head = requests.head(ZILLOW_URL, allow_redirects=True, timeout=30)
+        head.raise_for_status()
+        validators = get_validators(head)
+    except requests.RequestException as e:
+        print(f"HEAD request failed ({e}), falling back to a ranged GET")
+        validators = {}
 
-def get_latest_date_from_zillow():
-    """Fetch just the header row to check the latest date column"""
     try:
-        # Stream the file to avoid downloading everything
-        response = requests.get(ZILLOW_URL, stream=True)
-        response.raise_for_status()
+        if cached_date_str and validators_match(validators, stored):
+            return cached_date_str, datetime.strptime(cached_date_str, "%Y-%m-%d"), validators
+
+        # Conditional GET in case HEAD was inconclusive; only the first few KB
+        # are requested since the header row is all we need
+        request_headers = {'Range': f'bytes=0-{HEADER_BYTES - 1}'}
+        if cached_date_str and stored.get('etag'):
+            request_headers['If-None-Match'] = stored['etag']
+        if cached_date_str and stored.get('last_modified'):
+            request_headers['If-Modified-Since'] = stored['last_modified']
+
+        # Stream so a server that ignores Range (200) is still only read for one chunk
+        with requests.get(ZILLOW_URL, headers=request_headers, stream=True, timeout=30) as response:
+            if response.status_code == 304:
+                validators = get_validators(response, fallback=validators or stored)
+                return cached_date_str, datetime.strptime(cached_date_str, "%Y-%m-%d"), validators
+            response.raise_for_status()
+
+            head_bytes = next(response.iter_content(chunk_size=HEADER_BYTES), b'')
+            validators = get_validators(response, fallback=validators)
+
+        if b'\n' not in head_bytes:
+            raise ValueError(f"Header row longer than {HEADER_BYTES} bytes")
 
         # Get just the first line (header)
-        header_line = response.iter_lines().__next__().decode('utf-8')
+        header_line = head_bytes.split(b'\n')[0].decode('utf-8').rstrip('\r')
         columns = header_line.split(',')
 
         # Last column should be the most recent date
@@ -28,25 +68,43 @@ def get_latest_date_from_zillow():
         # Parse date (format: YYYY-MM-DD)
         latest_date = datetime.strptime(latest_date_str, "%Y-%m-%d")
 
-        return latest_date_str, latest_date
+        return latest_date_str, latest_date, validators
 
     except Exception as e:
         print(f"Error fetching Zillow data: {e}")
-        return None, None
+        return None, None, None
+
+def get_validators(response, fallback=None):
+    """Pull the HTTP cache validators from a response"""
+    fallback = fallback or {}
+    return {
+        'etag': response.headers.get('ETag') or fallback.get('etag'),
+        'last_modified': response.headers.get('Last-Modified') or fallback.get('last_modified')
+    }
+
+def validators_match(validators, stored):
+    """True if the server's validators show the stored file is unchanged"""
+    if validators.get('etag') and stored.get('etag'):
+        return validators['etag'] == stored['etag']
+    if validators.get('last_modified') and stored.get('last_modified'):
+        return validators['last_modified'] == stored['last_modified']
+    return False
 
-def get_stored_date():
-    """Get the last processed date from our metadata file"""
+def get_stored_metadata():
+    """Get the metadata saved by the last check"""
     if METADATA_FILE.exists():
         with open(METADATA_FILE, 'r') as f:
-            metadata = json.load(f)
-            return metadata.get('last_date')
-    return None
+            return json.load(f)
+    return {}
 
-def save_metadata(date_str):
-    """Save the current date as processed"""
+def save_metadata(date_str, validators=None):
+    """Save the current date as processed, along with the HTTP validators"""
+    validators = validators or {}
     METADATA_FILE.parent.mkdir(parents=True, exist_ok=True)
     metadata = {
         'last_date': date_str,
+        'etag': validators.get('etag'),
+        'last_modified': validators.get('last_modified'),
         'checked_at': datetime.now().isoformat()
     }
     with open(METADATA_FILE, 'w') as f:
@@ -56,28 +114,32 @@ def main():
     """Check for updates and return exit code"""
     print("Checking for new Zillow data...")
 
-    latest_date_str, latest_date = get_latest_date_from_zillow()
+    stored = get_stored_metadata()
+    latest_date_str, latest_date, validators = get_latest_date_from_zillow(stored)
 
     if not latest_date_str:
         print("Failed to fetch latest date from Zillow")
         return 1
 
-    stored_date = get_stored_date()
+    stored_date = stored.get('last_date')
 
     if stored_date is None:
         print(f"No previous data found. Latest available: {latest_date_str}")
         print("NEW_DATA=true")
-        save_metadata(latest_date_str)
+        save_metadata(latest_date_str, validators)
         return 0
 
     if latest_date_str != stored_date:
         print(f"New data available! Latest: {latest_date_str}, Previous: {stored_date}")
         print("NEW_DATA=true")
-        save_metadata(latest_date_str)
+        save_metadata(latest_date_str, validators)
         return 0
     else:
         print(f"No new data. Current version: {latest_date_str}")
         print("NEW_DATA=false")
+        if not validators_match(validators, stored):
+            # File was republished with the same dates; remember the new validators
+            save_metadata(latest_date_str, validators)
         return 0
 
 if __name__ == "__main__":
@@ -4,12 +4,11 @@ Create an interactive home price levels map with search functionality
 Refactored for automation in GitHub Actions
 """
 import pandas as pd
-import geopandas as gpd
 import numpy as np
 import json
-import warnings
+import gzip
 from pathlib import Path
-warnings.filterwarnings('ignore')
+from build_geometry_cache import load_centroids
 
 # Set up paths relative to script location
 SCRIPT_DIR = Path(__file__).parent
@@ -30,10 +29,11 @@ def create_price_levels_map():
         print(f"Error: {zillow_file} not found. Run download_data.py first.")
         return False
 
-    df = pd.read_csv(zillow_file)
+    # Read the header first so only the latest month is parsed, not every month
+    header = pd.read_csv(zillow_file, nrows=0).columns
 
     # Get date columns
-    date_columns = [col for col in df.columns if '-' in col]
+    date_columns = [col for col in header if '-' in col]
     if date_columns:
         latest_date = date_columns[-1]
         print(f"📅 Latest date: {latest_date}")
@@ -42,13 +42,16 @@ def create_price_levels_map():
         return False
 
     # Get current price levels
-    df_analysis = df[['RegionName', 'State', 'City', latest_date]].copy()
-    df_analysis = df_analysis.dropna(subset=[latest_date])
-    df_analysis['price_level'] = df_analysis[latest_date]
-    df_analysis['ZCTA5CE20'] = df_analysis['RegionName'].astype(str).str.zfill(5)
+    df_analysis = pd.read_csv(
+        zillow_file,
+        usecols=['RegionName', 'State', 'City', latest_date],
+        dtype={'RegionName': 'int32', 'State': 'category', 'City': 'category'}
+    )
 
-    # Remove extreme outliers
-    df_analysis = df_analysis[(df_analysis['price_level'] >= 10000) & (df_analysis['price_level'] <= 10000000)]
+    # Remove missing prices and extreme outliers in one pass (between() is False for NaN)
+    df_analysis = df_analysis.loc[df_analysis[latest_date].between(10000, 10000000)].copy()
+    df_analysis['price_level'] = df_analysis[latest_date]
+    df_analysis['ZCTA5CE20'] = np.char.zfill(df_analysis['RegionName'].to_numpy().astype('U5'), 5)
 
     print(f"📍 ZIP codes with price data: {len(df_analysis):,}")
     print(f"💰 Price range: ${df_analysis['price_level'].min():,.0f} to ${df_analysis['price_level'].max():,.0f}")
@@ -58,10 +61,15 @@ def create_price_levels_map():
     print("\n👥 Loading population data...")
     pop_file = RESOURCES_DIR / "populations" / "PopulationByZIP.csv"
     if pop_file.exists():
-        pop_df = pd.read_csv(pop_file, encoding='latin1')
-        pop_df.columns = ['zcta', 'name', 'population']
-        pop_df['zcta'] = pop_df['zcta'].astype(str).str.zfill(5)
-        pop_df['population'] = pd.to_numeric(pop_df['population'], errors='coerce').fillna(1000)
+        pop_df = pd.read_csv(
+            pop_file,
+            encoding='latin1',
+            usecols=[0, 2],
+            names=['zcta', 'population'],
+            header=0,
+            dtype={'zcta': 'int32', 'population': 'Int64'}
+        )
+        pop_df['zcta'] = np.char.zfill(pop_df['zcta'].to_numpy().astype('U5'), 5)
     else:
         print(f"Warning: Population file not found at {pop_file}")
         # Create dummy population data
@@ -74,41 +82,42 @@ def create_price_levels_map():
     print("\n🗺️ Loading ZIP code coordinates...")
     shapefile = RESOURCES_DIR / "shapefiles" / "cb_2020_us_zcta520_500k.shp"
     if shapefile.exists():
-        gdf = gpd.read_file(shapefile)
+        centroids = load_centroids(shapefile)
     else:
         print(f"Warning: Shapefile not found at {shapefile}")
         # We'll need to handle missing coordinates
         # For now, create a simple version without actual coordinates
         return create_simple_map_without_coordinates(df_analysis, latest_date)
 
-    # Get centroids
-    gdf['centroid'] = gdf.geometry.centroid
-    gdf['lat'] = gdf.centroid.y
-    gdf['lon'] = gdf.centroid.x
-
     # Merge all data
     print("\n🔄 Merging datasets...")
-    merged = df_analysis.merge(
-        gdf[['ZCTA5CE20', 'lat', 'lon']],
-        on='ZCTA5CE20',
-        how='inner'
-    )
-
-    merged = merged.merge(
-        pop_df[['zcta', 'population']],
-        left_on='ZCTA5CE20',
-        right_on='zcta',
-        how='left'
+    # Align everything on the ZIP index once and join index-to-index
+    centroids = centroids.set_index('ZCTA5CE20')[['lat', 'lon']]
+    pop_df = pop_df.set_index('zcta')[['population']]
+    merged = (
+        df_analysis.set_index('ZCTA5CE20')
+        .join(centroids, how='inner', validate='1:1')
+        .join(pop_df, how='left', validate='1:1')
+        .reset_index()
     )
 
     merged['population'] = merged['population'].fillna(1000)
 
     # Calculate bubble sizes
-    merged['bubble_size'] = np.sqrt(merged['population']) * 0.5
-    merged['bubble_size'] = merged['bubble_size'].clip(lower=3, upper=50)
+    # float32 is plenty for a radius clipped to [3, 50] and halves the memory traffic
+    pop = merged['population'].to_numpy(dtype=np.float32)
+    merged['bubble_size'] = np.clip(np.sqrt(pop) * np.float32(0.5), 3, 50)
+
+    # Price color bucket, an index into PALETTE in the page; right=True puts
+    # a price exactly on an edge in the lower bucket
+    bins = np.array([250000, 350000, 500000, 750000, 1000000])
+    merged['color_idx'] = np.digitize(merged['price_level'].to_numpy(), bins, right=True).astype('uint8')
+
+    # Lowercased "city zip" string so the page search needs no per-keystroke lowercasing
+    merged['search_key'] = merged['City'].str.lower().fillna('') + ' ' + merged['ZCTA5CE20']
 
     # Format for display
-    merged['price_display'] = merged['price_level'].apply(lambda x: f"${x:,.0f}")
+    merged['price_display'] = '$' + merged['price_level'].round().astype('int64').map('{:,}'.format)
 
     print(f"\n✅ Final dataset: {len(merged):,} ZIP codes")
 
@@ -122,7 +131,7 @@ def create_simple_map_without_coordinates(df_analysis, latest_date):
     print("Creating simplified map without geographic data...")
 
     # Create HTML with a table view instead
-    html_content = f"""<!DOCTYPE html>
+    header = f"""<!DOCTYPE html>
 <html>
 <head>
     <title>US Home Price Levels - {latest_date}</title>
@@ -176,18 +185,20 @@ def create_simple_map_without_coordinates(df_analysis, latest_date):
         <tbody>
 """
 
-    # Add top 100 entries
-    for _, row in df_analysis.head(100).iterrows():
-        html_content += f"""
+    # Top 100 entries, generated lazily and streamed straight to the file
+    rows = (
+        f"""
             <tr>
-                <td>{row['ZCTA5CE20']}</td>
-                <td>{row['City']}</td>
-                <td>{row['State']}</td>
-                <td>${row['price_level']:,.0f}</td>
+                <td>{row.ZCTA5CE20}</td>
+                <td>{row.City}</td>
+                <td>{row.State}</td>
+                <td>${row.price_level:,.0f}</td>
             </tr>
 """
+        for row in df_analysis.head(100).itertuples(index=False)
+    )
 
-    html_content += """
+    footer = """
         </tbody>
     </table>
 </body>
@@ -198,7 +209,14 @@ def create_simple_map_without_coordinates(df_analysis, latest_date):
     output_file = OUTPUT_DIR / "us_price_levels_with_search.html"
 
     with open(output_file, 'w') as f:
-        f.write(html_content)
+        f.write(header)
+        f.writelines(rows)
+        f.write(footer)
+
+    # Rewrite the pre-compressed copy too, so an earlier full map isn't served
+    # next to the table
+    gz_file = output_file.with_suffix('.html.gz')
+    gz_file.write_bytes(gzip.compress(output_file.read_bytes(), compresslevel=9))
 
     print(f"✓ Saved simplified map to {output_file}")
     return True
@@ -207,10 +225,20 @@ def create_html_map(merged, latest_date):
     """Generate the full interactive HTML map"""
     print("\n📝 Generating interactive HTML map...")
 
-    # Convert to JSON
-    data_json = merged[['ZCTA5CE20', 'City', 'State', 'lat', 'lon',
-                       'price_level', 'price_display', 'population',
-                       'bubble_size']].to_json(orient='records')
+    # Trim precision before serializing: 5 decimals is ~1 m, finer than any zoom level shows
+    merged = merged.assign(
+        lat=merged['lat'].round(5),
+        lon=merged['lon'].round(5),
+        bubble_size=merged['bubble_size'].round().astype('int16'),
+        population=merged['population'].astype('int32')
+    )
+
+    # Convert to columnar JSON (one array per field) so keys aren't repeated per ZIP
+    columns = ['ZCTA5CE20', 'City', 'State', 'lat', 'lon',
+               'price_display', 'population', 'color_idx', 'bubble_size', 'search_key']
+    data_json = '{' + ','.join(
+        f'"{col}":{merged[col].to_json(orient="values", double_precision=5)}' for col in columns
+    ) + '}'
 
     # HTML template (simplified version of the original)
     html_content = f"""<!DOCTYPE html>
@@ -282,22 +310,20 @@ def create_html_map(merged, latest_date):
             attribution: '© OpenStreetMap contributors'
         }}).addTo(map);
 
-        // Price color scale
-        function getColor(price) {{
-            return price > 1000000 ? '#F4743B' :
-                   price > 750000  ? '#FEC439' :
-                   price > 500000  ? '#67A275' :
-                   price > 350000  ? '#0BB4FF' :
-                   price > 250000  ? '#C6DCCB' :
-                                     '#DADFCE';
-        }}
+        // Price color scale, indexed by color_idx:
+        // <=250k, <=350k, <=500k, <=750k, <=1M, >1M
+        const PALETTE = ['#DADFCE', '#C6DCCB', '#0BB4FF', '#67A275', '#FEC439', '#F4743B'];
+
+        // Draw every bubble into one canvas instead of one SVG node per ZIP
+        const renderer = L.canvas({{padding: 0.5}});
 
         // Create markers
         const markers = [];
-        zipData.forEach(zip => {{
-            const marker = L.circleMarker([zip.lat, zip.lon], {{
-                radius: Math.min(zip.bubble_size, 20),
-                fillColor: getColor(zip.price_level),
+        for (let i = 0; i < zipData.ZCTA5CE20.length; i++) {{
+            const marker = L.circleMarker([zipData.lat[i], zipData.lon[i]], {{
+                renderer: renderer,
+                radius: Math.min(zipData.bubble_size[i], 20),
+                fillColor: PALETTE[zipData.color_idx[i]],
                 color: '#3D3733',
                 weight: 0.5,
                 opacity: 1,
@@ -305,35 +331,54 @@ def create_html_map(merged, latest_date):
             }}).addTo(map);
 
             marker.bindPopup(`
-                <b>${{zip.ZCTA5CE20}}</b><br>
-                ${{zip.City}}, ${{zip.State}}<br>
-                <b>${{zip.price_display}}</b><br>
-                Pop: ${{zip.population.toLocaleString()}}
+                <b>${{zipData.ZCTA5CE20[i]}}</b><br>
+                ${{zipData.City[i]}}, ${{zipData.State[i]}}<br>
+                <b>${{zipData.price_display[i]}}</b><br>
+                Pop: ${{zipData.population[i].toLocaleString()}}
             `);
 
-            markers.push({{marker: marker, data: zip}});
-        }});
+            markers.push(marker);
+        }}
+
+        // ZIP -> marker index, so an exact ZIP jumps straight to its marker
+        const zipIndex = new Map(zipData.ZCTA5CE20.map((zip, i) => [zip, i]));
+
+        // Highlight state per marker (0 normal, 1 match, 2 dimmed); search only
+        // restyles markers whose state changed and the canvas repaints once
+        const STATE_STYLES = [
+            {{fillOpacity: 0.7, weight: 0.5}},
+            {{fillOpacity: 1, weight: 2}},
+            {{fillOpacity: 0.1, weight: 0.5}}
+        ];
+        const markerState = new Uint8Array(markers.length);
 
-        // Search functionality
+        // Search functionality, debounced so bursts of keystrokes run one pass
+        let searchTimeout = null;
         document.getElementById('searchInput').addEventListener('input', function(e) {{
             const searchTerm = e.target.value.toLowerCase();
 
-            markers.forEach(item => {{
-                const matches = item.data.ZCTA5CE20.includes(searchTerm) ||
-                              item.data.City.toLowerCase().includes(searchTerm);
-
-                if (matches && searchTerm.length > 0) {{
-                    item.marker.setStyle({{fillOpacity: 1, weight: 2}});
-                    if (searchTerm.length === 5 && item.data.ZCTA5CE20 === searchTerm) {{
-                        map.setView([item.data.lat, item.data.lon], 10);
-                        item.marker.openPopup();
+            clearTimeout(searchTimeout);
+            searchTimeout = setTimeout(() => {{
+                if (searchTerm.length === 5) {{
+                    const i = zipIndex.get(searchTerm);
+                    if (i !== undefined) {{
+                        map.setView([zipData.lat[i], zipData.lon[i]], 10);
+                        markers[i].openPopup();
                     }}
-                }} else if (searchTerm.length === 0) {{
-                    item.marker.setStyle({{fillOpacity: 0.7, weight: 0.5}});
-                }} else {{
-                    item.marker.setStyle({{fillOpacity: 0.1, weight: 0.5}});
                 }}
-            }});
+
+                markers.forEach((marker, i) => {{
+                    let state = 0;
+                    if (searchTerm.length > 0) {{
+                        state = zipData.search_key[i].includes(searchTerm) ? 1 : 2;
+                    }}
+
+                    if (state !== markerState[i]) {{
+                        markerState[i] = state;
+                        marker.setStyle(STATE_STYLES[state]);
+                    }}
+                }});
+            }}, 100);
         }});
     </script>
 </body>
@@ -347,8 +392,13 @@ def create_html_map(merged, latest_date):
     with open(output_file, 'w') as f:
         f.write(html_content)
 
+    # Pre-compressed copy for hosts that can serve it with Content-Encoding: gzip
+    gz_file = output_file.with_suffix('.html.gz')
+    gz_file.write_bytes(gzip.compress(html_content.encode('utf-8'), compresslevel=9))
+
     print(f"✅ Map saved to {output_file}")
-    print(f"📊 File size: {output_file.stat().st_size / 1024 / 1024:.1f} MB")
+    print(f"📊 File size: {output_file.stat().st_size / 1024 / 1024:.1f} MB "
+          f"({gz_file.stat().st_size / 1024 / 1024:.1f} MB gzipped)")
 
 def main():
     """Main function"""
@@ -5,17 +5,23 @@ Create an interactive year-over-year home price map with search and local view f
 
 import pandas as pd
 import numpy as np
-import geopandas as gpd
-import json
-from datetime import datetime
+import orjson
+import gzip
+import base64
+import os
+import shutil
+from build_geometry_cache import load_centroids
+from build_state_boundaries import STATE_BOUNDARIES, STATES_URL
+from price_changes import find_year_ago_column, price_change_pct
 
 print("🏠 Creating Year-over-Year Home Price Map with Search...")
 
-# Load Zillow housing data
-df = pd.read_csv('/Users/azizsunderji/Dropbox/Home Economics/localmaps/PriceMaps/data/ZillowZip.csv')
+# Read the Zillow header first so only the two months we compare get parsed
+zillow_file = '/Users/azizsunderji/Dropbox/Home Economics/localmaps/PriceMaps/data/ZillowZip.csv'
+header = pd.read_csv(zillow_file, nrows=0).columns
 
 # Get date columns
-date_columns = [col for col in df.columns if '-' in col]
+date_columns = [col for col in header if '-' in col]
 if not date_columns:
     print("❌ Error: No date columns found in data")
     exit(1)
@@ -24,36 +30,8 @@ if not date_columns:
 latest_date = date_columns[-1]
 print(f"📅 Latest date: {latest_date}")
 
-# Parse the date to find year-ago
-date_obj = datetime.strptime(latest_date, "%Y-%m-%d")
-target_year = date_obj.year - 1
-target_month = date_obj.month
-
-# Find year-ago date
-year_ago_date = None
-for col in date_columns:
-    try:
-        col_date = datetime.strptime(col, "%Y-%m-%d")
-        if col_date.year == target_year and col_date.month == target_month:
-            year_ago_date = col
-            break
-    except:
-        continue
-
-if not year_ago_date:
-    # Find closest date from previous year
-    year_ago_candidates = []
-    for col in date_columns:
-        try:
-            col_date = datetime.strptime(col, "%Y-%m-%d")
-            if col_date.year == target_year:
-                year_ago_candidates.append((col, abs(col_date.month - target_month)))
-        except:
-            continue
-
-    if year_ago_candidates:
-        year_ago_candidates.sort(key=lambda x: x[1])
-        year_ago_date = year_ago_candidates[0][0]
+# Find year-ago date: the same month last year, else the closest month from last year
+year_ago_date = find_year_ago_column(date_columns)
 
 if not year_ago_date:
     print("❌ Error: Could not find year-ago data")
@@ -61,36 +39,48 @@ if not year_ago_date:
 
 print(f"📅 Year-ago date: {year_ago_date}")
 
-# Calculate price appreciation
-df_analysis = df[['RegionName', 'State', 'City', year_ago_date, latest_date]].copy()
-df_analysis = df_analysis.dropna(subset=[year_ago_date, latest_date])
-df_analysis['price_change_pct'] = ((df_analysis[latest_date] - df_analysis[year_ago_date]) / df_analysis[year_ago_date]) * 100
+# Load Zillow housing data with the multithreaded Arrow CSV reader
+df = pd.read_csv(
+    zillow_file,
+    usecols=['RegionName', 'State', 'City', year_ago_date, latest_date],
+    dtype={'RegionName': 'int32', 'State': 'category', 'City': 'category'},
+    engine='pyarrow'
+)
+
+# Calculate price appreciation on the raw arrays; missing prices and
+# changes outside [-50%, 100%] are dropped by one mask
+change_pct, keep = price_change_pct(df[latest_date].to_numpy(), df[year_ago_date].to_numpy(), inclusive=True)
+
+df_analysis = pd.DataFrame({
+    'RegionName': df['RegionName'].to_numpy()[keep],
+    'State': df['State'].to_numpy()[keep],
+    'City': df['City'].to_numpy()[keep],
+    'price_change_pct': change_pct[keep]
+})
 df_analysis['ZCTA5CE20'] = df_analysis['RegionName'].astype(str).str.zfill(5)
-df_analysis = df_analysis[(df_analysis['price_change_pct'] >= -50) & (df_analysis['price_change_pct'] <= 100)]
 
 print(f"📊 Calculated price changes for {len(df_analysis):,} ZIP codes")
 
 # Load population data
-pop_df = pd.read_csv('/Users/azizsunderji/Dropbox/Home Economics/Reference/Populations/PopulationByZIP.csv', encoding='latin1')
-pop_df.columns = ['zcta', 'name', 'population']
-pop_df['zcta'] = pop_df['zcta'].astype(str).str.zfill(5)
-pop_df['population'] = pd.to_numeric(pop_df['population'], errors='coerce').fillna(1000)
+pop_df = pd.read_csv('/Users/azizsunderji/Dropbox/Home Economics/Reference/Populations/PopulationByZIP.csv',
+                     encoding='latin1', names=['zcta', 'name', 'population'], header=0,
+                     dtype={'zcta': 'string', 'population': 'Int64'}, na_values=['', 'NA'])
+pop_df['zcta'] = pop_df['zcta'].str.zfill(5)
+pop_df['population'] = pop_df['population'].fillna(1000).astype(np.int32)
 
-# Load geometry for centroids
+# Load centroids from the cache written by build_geometry_cache.py
 print("\n📍 Loading ZIP code geometries...")
-gdf = gpd.read_file('/Users/azizsunderji/Dropbox/Home Economics/localmaps/PriceMaps/resources/shapefiles/cb_2020_us_zcta520_500k.shp')
-gdf['ZCTA5CE20'] = gdf['ZCTA5CE20'].astype(str).str.zfill(5)
-
-# Calculate centroids
-gdf['centroid'] = gdf.geometry.centroid
-gdf['lat'] = gdf.centroid.y
-gdf['lon'] = gdf.centroid.x
-
-# Merge all data
-gdf_merged = gdf.merge(df_analysis[['ZCTA5CE20', 'price_change_pct', 'City', 'State']], 
-                       on='ZCTA5CE20', how='inner')
-gdf_merged = gdf_merged.merge(pop_df[['zcta', 'name', 'population']], 
-                              left_on='ZCTA5CE20', right_on='zcta', how='left')
+shapefile = '/Users/azizsunderji/Dropbox/Home Economics/localmaps/PriceMaps/resources/shapefiles/cb_2020_us_zcta520_500k.shp'
+centroids_cache = '/Users/azizsunderji/Dropbox/Home Economics/localmaps/PriceMaps/resources/shapefiles/zcta_centroids.parquet'
+zcta_centroids = load_centroids(shapefile, centroids_cache)
+
+# Merge all data on the ZIP index (prices inner, population left)
+gdf_merged = (
+    zcta_centroids.set_index('ZCTA5CE20')
+    .join(df_analysis.set_index('ZCTA5CE20')[['price_change_pct', 'City', 'State']], how='inner', validate='1:1')
+    .join(pop_df.set_index('zcta')[['name', 'population']], how='left', validate='1:1')
+    .reset_index()
+)
 
 # Fill missing names
 gdf_merged['name'] = gdf_merged['name'].fillna(gdf_merged['City'])
@@ -98,25 +88,20 @@ gdf_merged['name'] = gdf_merged['name'].fillna('Unknown')
 gdf_merged['population'] = gdf_merged['population'].fillna(1000)
 
 # Create city-state name
-gdf_merged['city_state'] = gdf_merged.apply(
-    lambda x: f"{x['City']}, {x['State']}" if pd.notna(x['City']) else x['name'], 
-    axis=1
+city = gdf_merged['City']
+gdf_merged['city_state'] = np.where(
+    city.notna().to_numpy(),
+    (city.astype(str) + ', ' + gdf_merged['State'].astype(str)).to_numpy(),
+    gdf_merged['name'].to_numpy()
 )
 
 print(f"✅ Merged data for {len(gdf_merged):,} ZIP codes")
 
-# Calculate population-based radius
-conditions = [
-    gdf_merged['population'] < 5000,
-    gdf_merged['population'] < 20000,
-    gdf_merged['population'] < 50000,
-    gdf_merged['population'] < 100000,
-    gdf_merged['population'] < 500000,
-    gdf_merged['population'] >= 500000
-]
-
-choices = [3.0, 4.0, 6.0, 10.0, 16.0, 25.0]
-gdf_merged['radius'] = np.select(conditions, choices, default=1.0)
+# Calculate population-based radius; side='right' puts a population equal to
+# a threshold in the bucket above it (<5k, <20k, <50k, <100k, <500k, 500k+)
+bins = np.array([5000, 20000, 50000, 100000, 500000])
+choices = np.array([3.0, 4.0, 6.0, 10.0, 16.0, 25.0])
+gdf_merged['radius'] = choices[np.searchsorted(bins, gdf_merged['population'].to_numpy(), side='right')]
 
 # Calculate quintiles
 price_values = gdf_merged['price_change_pct'].values
@@ -127,32 +112,67 @@ print(f"   40th percentile: {quintiles[1]:.1f}%")
 print(f"   60th percentile: {quintiles[2]:.1f}%")
 print(f"   80th percentile: {quintiles[3]:.1f}%")
 
-# Create zip data
-zip_data = []
-for _, row in gdf_merged.iterrows():
-    # Clean up name
-    name = str(row['city_state'])
-    if name.startswith('zip code '):
-        name = name.replace('zip code ', 'ZIP ')
-    name = name.replace(', United States', '')
-    
-    zip_data.append({
-        'z': row['ZCTA5CE20'],
-        'lat': round(row['lat'], 3),
-        'lon': round(row['lon'], 3),
-        'p': round(row['price_change_pct'], 1),
-        'r': round(row['radius'], 1),
-        'pop': int(row['population']),
-        'n': name
-    })
+# Create zip data with column ops, cleaning up the Census-style names
+zip_df = pd.DataFrame({
+    'z': gdf_merged['ZCTA5CE20'],
+    'lat': gdf_merged['lat'].round(3),
+    'lon': gdf_merged['lon'].round(3),
+    'p': gdf_merged['price_change_pct'].round(1),
+    'r': gdf_merged['radius'].round(1),
+    'pop': gdf_merged['population'].astype(np.int64),
+    'n': gdf_merged['city_state'].astype(str)
+        .str.replace('^zip code ', 'ZIP ', regex=True)
+        .str.replace(', United States', '', regex=False)
+})
 
 # Sort by population (largest first) for better layering
-zip_data = sorted(zip_data, key=lambda x: x['pop'], reverse=True)
+zip_df = zip_df.sort_values('pop', ascending=False, kind='stable')
+
+# The rounded values fit comfortably in 32 bits; the records keep NumPy
+# scalars so orjson writes the float32 shortest form (same JSON text)
+zip_df = zip_df.astype({'lat': np.float32, 'lon': np.float32, 'p': np.float32, 'r': np.float32, 'pop': np.int32})
+
+# Population ships once as its own column (an Int32Array in the page)
+# instead of a "pop" key repeated in every record
+zip_pops = zip_df['pop'].to_numpy()
+zip_columns = [c for c in zip_df.columns if c != 'pop']
+zip_data = [dict(zip(zip_columns, values)) for values in zip(*(zip_df[c].to_numpy() for c in zip_columns))]
+
+# Lowercased names for the search box, aligned with zip_data so the page
+# doesn't rebuild a second copy of every record at load time
+search_names = zip_df['n'].str.lower().tolist()
+
+# Static grid of 0.5° cells ("row,col" -> indices into zip_data) so pan/zoom
+# only scans the cells overlapping the view instead of every ZIP
+GRID_CELLS_PER_DEGREE = 2
+cell_rows = np.floor(zip_df['lat'].to_numpy(np.float64) * GRID_CELLS_PER_DEGREE).astype(np.int32)
+cell_cols = np.floor(zip_df['lon'].to_numpy(np.float64) * GRID_CELLS_PER_DEGREE).astype(np.int32)
+cell_members = pd.Series(np.arange(len(zip_df))).groupby([cell_rows, cell_cols]).agg(list)
+zip_grid = {f'{row},{col}': members for (row, col), members in cell_members.items()}
 
 print(f"\n📦 Generated data for {len(zip_data):,} ZIP codes")
 
-# Create HTML with all features
-html_content = f"""<!DOCTYPE html>
+# Ship the data as one gzip+base64 blob that the page unpacks with
+# DecompressionStream; mtime=0 keeps the output reproducible
+zip_payload = orjson.dumps({'zipData': zip_data, 'zipPops': zip_pops, 'searchNames': search_names, 'zipGrid': zip_grid},
+                           option=orjson.OPT_SERIALIZE_NUMPY)
+zip_blob = base64.b64encode(gzip.compress(zip_payload, compresslevel=9, mtime=0))
+print(f"🗜️  Payload: {len(zip_payload)/1024/1024:.1f} MB JSON -> {len(zip_blob)/1024/1024:.1f} MB embedded")
+
+# State outlines: the simplified copy is served next to the page (and preloaded)
+# once build_state_boundaries.py has produced it, otherwise the page goes
+# straight to the full remote file
+if STATE_BOUNDARIES.exists():
+    states_url = STATE_BOUNDARIES.name
+    states_preload = f'<link rel="preload" href="{states_url}" as="fetch" crossorigin/>\n'
+else:
+    print("⚠️  Simplified state boundaries not found, the page will fetch the remote copy")
+    states_url = STATES_URL
+    states_preload = ''
+
+# Create HTML with all features; the page is written as head + blob + tail
+# so the payload is never copied into the template string
+html_head = f"""<!DOCTYPE html>
 <html>
 <head>
 <meta charset="UTF-8">
@@ -162,7 +182,7 @@ html_content = f"""<!DOCTYPE html>
 <link rel="stylesheet" href="https://unpkg.com/leaflet-draw@1.0.4/dist/leaflet.draw.css"/>
 <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
 <script src="https://unpkg.com/leaflet-draw@1.0.4/dist/leaflet.draw.js"></script>
-<style>
+{states_preload}<style>
 body {{margin:0; padding:0; font-family:-apple-system,BlinkMacSystemFont,"Segoe UI",Roboto,Helvetica,Arial,sans-serif;}}
 #map {{position:absolute; top:0; bottom:0; width:100%;}}
 
@@ -444,8 +464,37 @@ Zoom in for details
 <a href="https://www.home-economics.us" target="_blank">www.home-economics.us</a>
 </div>
 <script>
+// ZIP data, populations, lowercased search names and grid index, gzipped and base64 encoded
+const ZIP_PAYLOAD = '"""
+
+html_tail = f"""';
+
 // ZIP data
-const zipData = {json.dumps(zip_data, separators=(',', ':'))};
+let zipData = [];
+
+// Populations, aligned with zipData
+let zipPops = new Int32Array(0);
+
+// Lowercased place names for search, aligned with zipData
+let searchNames = [];
+
+// ZIP indices bucketed into 0.5° cells, keyed "row,col"
+let zipGrid = {{}};
+
+// Unpack the embedded payload into zipData, zipPops, searchNames and zipGrid
+async function loadZipPayload() {{
+    const bytes = Uint8Array.from(atob(ZIP_PAYLOAD), c => c.charCodeAt(0));
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    const payload = JSON.parse(await new Response(stream).text());
+    zipData = payload.zipData;
+    zipPops = Int32Array.from(payload.zipPops);
+    searchNames = payload.searchNames;
+    zipGrid = payload.zipGrid;
+}}
+
+// Grid cell size and the range of occupied cells
+const GRID_CELLS_PER_DEGREE = {GRID_CELLS_PER_DEGREE};
+const GRID_EXTENT = [{cell_rows.min()}, {cell_rows.max()}, {cell_cols.min()}, {cell_cols.max()}];
 
 // Global quintiles
 const globalQuintiles = [{quintiles[0]:.1f}, {quintiles[1]:.1f}, {quintiles[2]:.1f}, {quintiles[3]:.1f}];
@@ -466,17 +515,6 @@ let drawControl = null;
 let drawnItems = null;
 let isDrawingMode = false;
 
-// Create search index for fast lookups
-const searchIndex = zipData.map(z => ({{
-    zip: z.z,
-    name: z.n.toLowerCase(),
-    nameOriginal: z.n,
-    lat: z.lat,
-    lon: z.lon,
-    price: z.p,
-    pop: z.pop
-}}));
-
 // Initialize map
 const map = L.map('map', {{
     center: [39.8283, -98.5795],
@@ -566,10 +604,35 @@ function calculateQuintiles(values) {{
     ];
 }}
 
-// Get visible ZIPs
+// Get indices of ZIPs inside a LatLngBounds using the grid; keeps zipData (population) order
+function getZipsInBounds(bounds) {{
+    const rowStart = Math.max(Math.floor(bounds.getSouth() * GRID_CELLS_PER_DEGREE), GRID_EXTENT[0]);
+    const rowEnd = Math.min(Math.floor(bounds.getNorth() * GRID_CELLS_PER_DEGREE), GRID_EXTENT[1]);
+    const colStart = Math.max(Math.floor(bounds.getWest() * GRID_CELLS_PER_DEGREE), GRID_EXTENT[2]);
+    const colEnd = Math.min(Math.floor(bounds.getEast() * GRID_CELLS_PER_DEGREE), GRID_EXTENT[3]);
+
+    const candidates = [];
+    for (let row = rowStart; row <= rowEnd; row++) {{
+        for (let col = colStart; col <= colEnd; col++) {{
+            const cell = zipGrid[row + ',' + col];
+            if (cell) {{
+                for (let i = 0; i < cell.length; i++) candidates.push(cell[i]);
+            }}
+        }}
+    }}
+    candidates.sort((a, b) => a - b);
+
+    const result = [];
+    for (let i = 0; i < candidates.length; i++) {{
+        const z = zipData[candidates[i]];
+        if (bounds.contains([z.lat, z.lon])) result.push(candidates[i]);
+    }}
+    return result;
+}}
+
+// Get indices of visible ZIPs
 function getVisibleZips() {{
-    const bounds = map.getBounds();
-    return zipData.filter(z => bounds.contains([z.lat, z.lon]));
+    return getZipsInBounds(map.getBounds());
 }}
 
 // Update local quintiles
@@ -583,8 +646,8 @@ function updateLocalQuintiles() {{
         currentMaxPop = null;
         updateLegend(globalQuintiles, visibleZips.length, null, null, false);
     }} else {{
-        const prices = visibleZips.map(z => z.p);
-        const populations = visibleZips.map(z => z.pop);
+        const prices = visibleZips.map(i => zipData[i].p);
+        const populations = visibleZips.map(i => zipPops[i]);
         currentQuintiles = calculateQuintiles(prices);
         currentMinPop = Math.min(...populations);
         currentMaxPop = Math.max(...populations);
@@ -696,27 +759,21 @@ function clearDrawnBoundary() {{
     }}
 }}
 
-// Get ZIPs within drawn boundary
+// Get indices of ZIPs within drawn boundary
 function getZipsInBoundary() {{
     if (!drawnBoundary) return null;
 
     const layer = drawnBoundary;
-    const filtered = zipData.filter(zip => {{
-        const point = L.latLng(zip.lat, zip.lon);
-
-        // For rectangles, just check bounds
-        if (layer instanceof L.Rectangle) {{
-            return layer.getBounds().contains(point);
-        }}
 
-        // For polygons, check bounds first, then precise check
-        if (layer instanceof L.Polygon) {{
-            if (!layer.getBounds().contains(point)) return false;
-            return isPointInPolygon(point, layer);
-        }}
-
-        return false;
-    }});
+    // Rectangles are exactly their bounds; polygons get a precise check
+    // on the grid candidates inside their bounds
+    let filtered = [];
+    if (layer instanceof L.Rectangle) {{
+        filtered = getZipsInBounds(layer.getBounds());
+    }} else if (layer instanceof L.Polygon) {{
+        filtered = getZipsInBounds(layer.getBounds())
+            .filter(i => isPointInPolygon(L.latLng(zipData[i].lat, zipData[i].lon), layer));
+    }}
 
     console.log(`Found ${{filtered.length}} ZIPs in boundary`);
     return filtered;
@@ -752,8 +809,8 @@ function updateBoundaryQuintiles() {{
         currentMaxPop = null;
         updateLegend(globalQuintiles, boundaryZips ? boundaryZips.length : 0, null, null, false);
     }} else {{
-        const prices = boundaryZips.map(z => z.p);
-        const populations = boundaryZips.map(z => z.pop);
+        const prices = boundaryZips.map(i => zipData[i].p);
+        const populations = boundaryZips.map(i => zipPops[i]);
         currentQuintiles = calculateQuintiles(prices);
         currentMinPop = Math.min(...populations);
         currentMaxPop = Math.max(...populations);
@@ -781,19 +838,21 @@ function updateMarkers() {{
     let visibleZips;
     if (drawnBoundary && isLocalMode) {{
         const boundaryZips = getZipsInBoundary();
-        visibleZips = boundaryZips ? boundaryZips.filter(d => bounds.contains([d.lat, d.lon])) : [];
+        visibleZips = boundaryZips ? boundaryZips.filter(i => bounds.contains([zipData[i].lat, zipData[i].lon])) : [];
     }} else {{
-        visibleZips = zipData.filter(d => bounds.contains([d.lat, d.lon]));
+        visibleZips = getZipsInBounds(bounds);
     }}
 
     const markers = [];
     
-    visibleZips.forEach(zip => {{
+    visibleZips.forEach(i => {{
+        const zip = zipData[i];
+        const pop = zipPops[i];
         let radius = zip.r;
         
         // Local mode population-relative sizing
         if (isLocalMode && currentMinPop !== null && currentMaxPop !== null && currentMaxPop > currentMinPop) {{
-            const relativePosition = (zip.pop - currentMinPop) / (currentMaxPop - currentMinPop);
+            const relativePosition = (pop - currentMinPop) / (currentMaxPop - currentMinPop);
             radius = 10 + (relativePosition * 12);
             
             if (zoom <= 3) {{
@@ -829,20 +888,20 @@ function updateMarkers() {{
         if (zoom <= 1) {{
             fillOpacity = 0.4;
         }} else if (zoom === 2) {{
-            if (zip.pop < 50000) fillOpacity = 0.3;
-            else if (zip.pop < 75000) fillOpacity = 0.4;
+            if (pop < 50000) fillOpacity = 0.3;
+            else if (pop < 75000) fillOpacity = 0.4;
             else fillOpacity = 0.5;
         }} else if (zoom === 3) {{
-            if (zip.pop < 30000) fillOpacity = 0.4;
-            else if (zip.pop < 50000) fillOpacity = 0.6;
+            if (pop < 30000) fillOpacity = 0.4;
+            else if (pop < 50000) fillOpacity = 0.6;
             else fillOpacity = 0.75;
         }} else if (zoom === 4) {{
-            if (zip.pop < 20000) fillOpacity = 0.5;
-            else if (zip.pop < 50000) fillOpacity = 0.7;
+            if (pop < 20000) fillOpacity = 0.5;
+            else if (pop < 50000) fillOpacity = 0.7;
         }} else if (zoom === 5) {{
-            if (zip.pop < 5000) fillOpacity = 0.4;
-            else if (zip.pop < 15000) fillOpacity = 0.6;
-            else if (zip.pop < 30000) fillOpacity = 0.7;
+            if (pop < 5000) fillOpacity = 0.4;
+            else if (pop < 15000) fillOpacity = 0.6;
+            else if (pop < 30000) fillOpacity = 0.7;
         }}
         
         const marker = L.circleMarker([zip.lat, zip.lon], {{
@@ -858,6 +917,7 @@ function updateMarkers() {{
         
         if (zoom >= 8) {{
             marker.zipData = zip;
+            marker.zipPop = pop;
             
             marker.on('mouseover', function(e) {{
                 const data = e.target.zipData;
@@ -865,7 +925,7 @@ function updateMarkers() {{
                 tooltip.innerHTML = '<strong>' + data.z + '</strong><br>' +
                                   data.n + '<br>' +
                                   'YoY Change: ' + changeText + '<br>' +
-                                  data.pop.toLocaleString() + ' pop';
+                                  e.target.zipPop.toLocaleString() + ' pop';
                 tooltip.style.display = 'block';
             }});
             
@@ -909,7 +969,7 @@ function handleSearch(event) {{
     }} else if (event.key === 'Enter') {{
         event.preventDefault();
         if (selectedSuggestionIndex >= 0) {{
-            goToLocation(currentSuggestions[selectedSuggestionIndex].zip);
+            goToLocation(currentSuggestions[selectedSuggestionIndex].z);
         }} else {{
             performSearch();
         }}
@@ -941,20 +1001,20 @@ function showSuggestions(query) {{
     
     // Exact ZIP match
     if (/^\\d{{1,5}}$/.test(query)) {{
-        matches = searchIndex.filter(item => item.zip.startsWith(query)).slice(0, 10);
+        matches = zipData.filter(z => z.z.startsWith(query)).slice(0, 10);
     }}
     
     // Name match
     if (matches.length === 0) {{
-        matches = searchIndex.filter(item => item.name.includes(queryLower)).slice(0, 10);
+        matches = zipData.filter((z, i) => searchNames[i].includes(queryLower)).slice(0, 10);
     }}
     
     currentSuggestions = matches;
     
     if (matches.length > 0) {{
-        suggestionsDiv.innerHTML = matches.map((item, index) => 
-            `<div class="suggestion-item" onclick="goToLocation('${{item.zip}}')" data-index="${{index}}">
-                <strong>${{item.zip}}</strong> - ${{item.nameOriginal}}
+        suggestionsDiv.innerHTML = matches.map((z, index) => 
+            `<div class="suggestion-item" onclick="goToLocation('${{z.z}}')" data-index="${{index}}">
+                <strong>${{z.z}}</strong> - ${{z.n}}
             </div>`
         ).join('');
         suggestionsDiv.classList.add('active');
@@ -982,32 +1042,33 @@ function performSearch() {{
     const queryLower = query.toLowerCase();
     
     // Try exact ZIP match first
-    let found = searchIndex.find(item => item.zip === query);
+    let found = zipData.find(z => z.z === query);
     
     // Try ZIP prefix
     if (!found && /^\\d{{1,5}}$/.test(query)) {{
-        found = searchIndex.find(item => item.zip.startsWith(query));
+        found = zipData.find(z => z.z.startsWith(query));
     }}
     
     // Try name match
     if (!found) {{
-        found = searchIndex.find(item => item.name.includes(queryLower));
+        found = zipData.find((z, i) => searchNames[i].includes(queryLower));
     }}
     
     if (found) {{
-        goToLocation(found.zip);
+        goToLocation(found.z);
     }} else {{
         alert('Location not found. Try a ZIP code or city name.');
     }}
 }}
 
 function goToLocation(zipCode) {{
-    const location = searchIndex.find(item => item.zip === zipCode);
-    if (!location) return;
+    const index = zipData.findIndex(z => z.z === zipCode);
+    if (index < 0) return;
+    const location = zipData[index];
     
     // Close suggestions and update search box
     document.getElementById('suggestions').classList.remove('active');
-    document.getElementById('searchBox').value = zipCode + ' - ' + location.nameOriginal;
+    document.getElementById('searchBox').value = zipCode + ' - ' + location.n;
     selectedSuggestionIndex = -1;
     currentSuggestions = [];
     
@@ -1022,14 +1083,14 @@ function goToLocation(zipCode) {{
         updateMarkers();
         
         // Show popup for the location
-        const changeText = location.price >= 0 ? `+${{location.price}}%` : `${{location.price}}%`;
+        const changeText = location.p >= 0 ? `+${{location.p}}%` : `${{location.p}}%`;
         const popup = L.popup()
             .setLatLng([location.lat, location.lon])
             .setContent(`
-                <strong>${{location.zip}}</strong><br>
-                ${{location.nameOriginal}}<br>
+                <strong>${{location.z}}</strong><br>
+                ${{location.n}}<br>
                 Year-over-Year Change: ${{changeText}}<br>
-                Population: ${{location.pop.toLocaleString()}}
+                Population: ${{zipPops[index].toLocaleString()}}
             `)
             .openOn(map);
     }}, 1600);
@@ -1091,8 +1152,12 @@ map.on(L.Draw.Event.DELETED, function(event) {{
     }});
 }});
 
-// Add state boundaries
-fetch('https://raw.githubusercontent.com/PublicaMundi/MappingAPI/master/data/geojson/us-states.json')
+// Add state boundaries, falling back to the full remote file if the
+// simplified copy wasn't deployed next to this page
+const STATES_FALLBACK_URL = '{STATES_URL}';
+fetch('{states_url}')
+    .then(response => response.ok ? response : fetch(STATES_FALLBACK_URL))
+    .catch(() => fetch(STATES_FALLBACK_URL))
     .then(response => response.json())
     .then(data => {{
         const stateBoundariesLayer = L.geoJSON(data, {{
@@ -1119,19 +1184,29 @@ L.tileLayer('https://{{s}}.basemaps.cartocdn.com/light_only_labels/{{z}}/{{x}}/{
     zIndex: 1000
 }}).addTo(map);
 
-// Initial render
-updateMarkers();
+// Initial render once the data is unpacked
+loadZipPayload().then(updateMarkers);
 </script>
 </body>
 </html>"""
 
 # Write HTML file
 output_file = '/Users/azizsunderji/Dropbox/Home Economics/localmaps/PriceMaps/output/ProMap.html'
-with open(output_file, 'w', encoding='utf-8') as f:
-    f.write(html_content)
+with open(output_file, 'wb') as f:
+    f.write(html_head.encode('utf-8'))
+    f.write(zip_blob)
+    f.write(html_tail.encode('utf-8'))
+
+# Serve the simplified state outlines from the same directory as the page, and
+# from the repo's output/ that the workflow commits and deploys
+if STATE_BOUNDARIES.exists():
+    repo_output_dir = STATE_BOUNDARIES.parent.parent / "output"
+    for states_dir in {os.path.realpath(os.path.dirname(output_file)), os.path.realpath(repo_output_dir)}:
+        os.makedirs(states_dir, exist_ok=True)
+        shutil.copy(STATE_BOUNDARIES, os.path.join(states_dir, STATE_BOUNDARIES.name))
 
 print(f"\n✅ Successfully created: {output_file}")
-print(f"📏 File size: {len(html_content)/1024/1024:.1f} MB")
+print(f"📏 File size: {os.path.getsize(output_file)/1024/1024:.1f} MB")
 print("\n🎯 Features implemented:")
 print("   • Search with autocomplete for ZIP codes and place names")
 print("   • Local view mode with dynamic quintile recalculation")
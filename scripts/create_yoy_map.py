@@ -5,12 +5,13 @@ Refactored for automation in GitHub Actions
 """
 import pandas as pd
 import numpy as np
-import geopandas as gpd
 import json
-from datetime import datetime
+import gzip
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import warnings
-warnings.filterwarnings('ignore')
+from build_geometry_cache import CENTROIDS_CACHE, load_centroids
+from price_changes import find_year_ago_column, price_change_pct
 
 # Set up paths relative to script location
 SCRIPT_DIR = Path(__file__).parent
@@ -18,6 +19,8 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 DATA_DIR = PROJECT_ROOT / "data"
 RESOURCES_DIR = PROJECT_ROOT / "resources"
 OUTPUT_DIR = PROJECT_ROOT / "output"
+DATA_FILE_NAME = "yoy_data.json.gz"
+GRID_CELLS_PER_DEGREE = 2
 
 def create_yoy_map():
     """Generate the year-over-year price change map"""
@@ -30,10 +33,11 @@ def create_yoy_map():
         print(f"Error: {zillow_file} not found. Run download_data.py first.")
         return False
 
-    df = pd.read_csv(zillow_file)
+    # Read the header first so only the two months we compare get parsed
+    header = pd.read_csv(zillow_file, nrows=0).columns
 
     # Get date columns
-    date_columns = [col for col in df.columns if '-' in col]
+    date_columns = [col for col in header if '-' in col]
     if not date_columns:
         print("Error: No date columns found")
         return False
@@ -42,36 +46,8 @@ def create_yoy_map():
     latest_date = date_columns[-1]
     print(f"📅 Latest date: {latest_date}")
 
-    # Parse the date to find year-ago
-    date_obj = datetime.strptime(latest_date, "%Y-%m-%d")
-    target_year = date_obj.year - 1
-    target_month = date_obj.month
-
-    # Find year-ago date
-    year_ago_date = None
-    for col in date_columns:
-        try:
-            col_date = datetime.strptime(col, "%Y-%m-%d")
-            if col_date.year == target_year and col_date.month == target_month:
-                year_ago_date = col
-                break
-        except:
-            continue
-
-    if not year_ago_date:
-        # Find closest date from previous year
-        year_ago_candidates = []
-        for col in date_columns:
-            try:
-                col_date = datetime.strptime(col, "%Y-%m-%d")
-                if col_date.year == target_year:
-                    year_ago_candidates.append((col, abs(col_date.month - target_month)))
-            except:
-                continue
-
-        if year_ago_candidates:
-            year_ago_candidates.sort(key=lambda x: x[1])
-            year_ago_date = year_ago_candidates[0][0]
+    # Find year-ago date: the same month last year, else the closest month from last year
+    year_ago_date = find_year_ago_column(date_columns)
 
     if not year_ago_date:
         print("Error: Could not find year-ago data")
@@ -79,18 +55,56 @@ def create_yoy_map():
 
     print(f"📅 Year-ago date: {year_ago_date}")
 
+    pop_file = RESOURCES_DIR / "populations" / "PopulationByZIP.csv"
+    shapefile = RESOURCES_DIR / "shapefiles" / "cb_2020_us_zcta520_500k.shp"
+
+    # Reuse the merged dataset from the last run if none of the inputs changed;
+    # lat/lon come from the centroid cache, so it and its builder count as
+    # inputs, as does the shared YoY change helper
+    cache = merged_cache_path(zillow_file, pop_file, shapefile, CENTROIDS_CACHE,
+                              SCRIPT_DIR / "build_geometry_cache.py",
+                              SCRIPT_DIR / "price_changes.py", Path(__file__))
+    if shapefile.exists() and cache.exists():
+        print(f"\n⚡ Inputs unchanged, loading cached dataset {cache.name}")
+        merged = pd.read_parquet(cache)
+        print(f"\n✅ Final dataset: {len(merged):,} ZIP codes")
+        create_yoy_html_map(merged, latest_date, year_ago_date)
+        return True
+
+    # The three inputs don't depend on each other until the merge, so read them
+    # side by side; the CSV parser and the parquet/GDAL readers release the GIL
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        zillow_future = executor.submit(
+            pd.read_csv,
+            zillow_file,
+            usecols=['RegionName', 'State', 'City', latest_date, year_ago_date],
+            dtype={'RegionName': 'int32', 'State': 'category', 'City': 'category'}
+        )
+        # Only the ZIP and population columns, named on read
+        pop_future = executor.submit(
+            pd.read_csv,
+            pop_file,
+            encoding='latin1',
+            usecols=[0, 2],
+            names=['zip', 'population'],
+            header=0,
+            dtype={'zip': 'int32'}
+        ) if pop_file.exists() else None
+        # Equal-area centroids, computed once and cached by build_geometry_cache.py
+        centroids_future = executor.submit(load_centroids, shapefile) if shapefile.exists() else None
+
     # Calculate YoY change
-    df_yoy = df[['RegionName', 'State', 'City', latest_date, year_ago_date]].copy()
-    df_yoy = df_yoy.dropna(subset=[latest_date, year_ago_date])
+    df_yoy = zillow_future.result()
 
-    df_yoy['latest_price'] = df_yoy[latest_date]
-    df_yoy['year_ago_price'] = df_yoy[year_ago_date]
-    df_yoy['yoy_change'] = ((df_yoy['latest_price'] - df_yoy['year_ago_price']) /
-                            df_yoy['year_ago_price'] * 100)
+    # One pass over the raw price arrays; missing prices and changes outside
+    # (-50%, 100%) are dropped by one mask
+    latest_prices = df_yoy[latest_date].to_numpy()
+    yoy_change, keep = price_change_pct(latest_prices, df_yoy[year_ago_date].to_numpy())
 
-    # Filter extreme outliers
-    df_yoy = df_yoy[(df_yoy['yoy_change'] > -50) & (df_yoy['yoy_change'] < 100)]
-    df_yoy['ZCTA5CE20'] = df_yoy['RegionName'].astype(str).str.zfill(5)
+    # Join on int32 ZIPs; they are zero-padded only when the page data is written
+    df_yoy = df_yoy.loc[keep, ['RegionName', 'State', 'City']].rename(columns={'RegionName': 'zip'})
+    df_yoy['latest_price'] = latest_prices[keep]
+    df_yoy['yoy_change'] = yoy_change[keep]
 
     print(f"📍 ZIP codes with YoY data: {len(df_yoy):,}")
     print(f"📈 YoY change range: {df_yoy['yoy_change'].min():.1f}% to {df_yoy['yoy_change'].max():.1f}%")
@@ -98,70 +112,78 @@ def create_yoy_map():
 
     # Load population data
     print("\n👥 Loading population data...")
-    pop_file = RESOURCES_DIR / "populations" / "PopulationByZIP.csv"
-    if pop_file.exists():
-        pop_df = pd.read_csv(pop_file, encoding='latin1')
-        pop_df.columns = ['zcta', 'name', 'population']
-        pop_df['zcta'] = pop_df['zcta'].astype(str).str.zfill(5)
+    if pop_future:
+        pop_df = pop_future.result()
         pop_df['population'] = pd.to_numeric(pop_df['population'], errors='coerce').fillna(1000)
     else:
         print(f"Warning: Population file not found")
         pop_df = pd.DataFrame({
-            'zcta': df_yoy['ZCTA5CE20'],
+            'zip': df_yoy['zip'],
             'population': 5000
         })
 
     # Load ZIP code shapefile
     print("\n🗺️ Loading ZIP code coordinates...")
-    shapefile = RESOURCES_DIR / "shapefiles" / "cb_2020_us_zcta520_500k.shp"
-    if shapefile.exists():
-        gdf = gpd.read_file(shapefile)
+    if centroids_future:
+        centroids = centroids_future.result()
+        centroids['zip'] = centroids['ZCTA5CE20'].astype('int32')
     else:
         print(f"Warning: Shapefile not found")
         return create_simple_yoy_table(df_yoy, latest_date, year_ago_date)
 
-    # Get centroids
-    gdf['centroid'] = gdf.geometry.centroid
-    gdf['lat'] = gdf.centroid.y
-    gdf['lon'] = gdf.centroid.x
-
     # Merge all data
     print("\n🔄 Merging datasets...")
     merged = df_yoy.merge(
-        gdf[['ZCTA5CE20', 'lat', 'lon']],
-        on='ZCTA5CE20',
+        centroids[['zip', 'lat', 'lon']],
+        on='zip',
         how='inner'
     )
 
     merged = merged.merge(
-        pop_df[['zcta', 'population']],
-        left_on='ZCTA5CE20',
-        right_on='zcta',
+        pop_df,
+        on='zip',
         how='left'
     )
 
     merged['population'] = merged['population'].fillna(1000)
+    merged['ZCTA5CE20'] = merged['zip'].astype(str).str.zfill(5)
 
     # Calculate bubble sizes
     merged['bubble_size'] = np.sqrt(merged['population']) * 0.5
     merged['bubble_size'] = merged['bubble_size'].clip(lower=3, upper=50)
 
-    # Format for display
-    merged['yoy_display'] = merged['yoy_change'].apply(lambda x: f"{x:+.1f}%")
-    merged['price_display'] = merged['latest_price'].apply(lambda x: f"${x:,.0f}")
+    # Marker radius (capped for the map) and YoY color bucket, an index into
+    # PALETTE in the page; right=True matches the page's strict > thresholds
+    merged['radius'] = merged['bubble_size'].clip(upper=20)
+    bins = np.array([-5, 0, 5, 10])
+    merged['color_idx'] = np.digitize(merged['yoy_change'].to_numpy(), bins, right=True).astype('uint8')
+
+    # Lowercased "city zip" string so the page search needs no per-keystroke lowercasing
+    merged['search_key'] = merged['City'].astype(str).str.lower().where(merged['City'].notna(), '') + ' ' + merged['ZCTA5CE20']
 
     print(f"\n✅ Final dataset: {len(merged):,} ZIP codes")
 
+    # Cache the merged dataset for the next run and drop caches of older inputs
+    for old_cache in DATA_DIR.glob("merged-*.parquet"):
+        old_cache.unlink()
+    merged.to_parquet(cache, compression='zstd', index=False)
+
     # Generate the HTML map
     create_yoy_html_map(merged, latest_date, year_ago_date)
 
     return True
 
+def merged_cache_path(*inputs):
+    """Path of the merged dataset cache, keyed on the mtimes and sizes of the inputs"""
+    stamps = [f"{p.stat().st_mtime_ns}:{p.stat().st_size}" if p.exists() else "missing" for p in inputs]
+    key = hashlib.sha1("-".join(stamps).encode()).hexdigest()[:12]
+    return DATA_DIR / f"merged-{key}.parquet"
+
 def create_simple_yoy_table(df_yoy, latest_date, year_ago_date):
     """Create a simplified table view when shapefile is missing"""
     print("Creating simplified YoY table view...")
 
-    html_content = f"""<!DOCTYPE html>
+    header = f"""<!DOCTYPE html>
 <html>
 <head>
     <title>US Home Price YoY Changes - {latest_date}</title>
@@ -222,22 +244,22 @@ def create_simple_yoy_table(df_yoy, latest_date, year_ago_date):
         <tbody>
 """
 
-    # Sort by YoY change and show top/bottom
+    # Sort by YoY change; the top 100 rows are generated lazily and streamed straight to the file
     df_sorted = df_yoy.sort_values('yoy_change', ascending=False)
-
-    for _, row in df_sorted.head(100).iterrows():
-        change_class = 'positive' if row['yoy_change'] > 0 else 'negative'
-        html_content += f"""
+    rows = (
+        f"""
             <tr>
-                <td>{row['ZCTA5CE20']}</td>
-                <td>{row['City']}</td>
-                <td>{row['State']}</td>
-                <td>${row['latest_price']:,.0f}</td>
-                <td class="{change_class}">{row['yoy_change']:+.1f}%</td>
+                <td>{row.zip:05d}</td>
+                <td>{row.City}</td>
+                <td>{row.State}</td>
+                <td>${row.latest_price:,.0f}</td>
+                <td class="{'positive' if row.yoy_change > 0 else 'negative'}">{row.yoy_change:+.1f}%</td>
             </tr>
 """
+        for row in df_sorted.head(100).itertuples(index=False)
+    )
 
-    html_content += """
+    footer = """
         </tbody>
     </table>
 </body>
@@ -248,7 +270,15 @@ def create_simple_yoy_table(df_yoy, latest_date, year_ago_date):
     output_file = OUTPUT_DIR / "us_yoy_price_map_with_search.html"
 
     with open(output_file, 'w') as f:
-        f.write(html_content)
+        f.write(header)
+        f.writelines(rows)
+        f.write(footer)
+
+    # Replace the outputs of an earlier full run so they aren't served next to
+    # the table: the pre-compressed copy becomes the table, the data sidecar goes
+    gz_file = output_file.with_suffix('.html.gz')
+    gz_file.write_bytes(gzip.compress(output_file.read_bytes(), compresslevel=9))
+    (OUTPUT_DIR / DATA_FILE_NAME).unlink(missing_ok=True)
 
     print(f"✓ Saved simplified YoY table to {output_file}")
     return True
@@ -257,10 +287,29 @@ def create_yoy_html_map(merged, latest_date, year_ago_date):
     """Generate the full interactive YoY HTML map"""
     print("\n📝 Generating interactive YoY map...")
 
-    # Convert to JSON
-    data_json = merged[['ZCTA5CE20', 'City', 'State', 'lat', 'lon',
-                       'yoy_change', 'yoy_display', 'latest_price',
-                       'price_display', 'population', 'bubble_size']].to_json(orient='records')
+    # Slice the ZIPs into 0.5° grid tiles so the page only builds and draws the
+    # markers for tiles in view. Rows are sorted by tile (latitude band first),
+    # so each tile is a contiguous run of zipData and the grid only needs
+    # "row,col" -> [start, end)
+    cell_rows = np.floor(merged['lat'].to_numpy() * GRID_CELLS_PER_DEGREE).astype(np.int32)
+    cell_cols = np.floor(merged['lon'].to_numpy() * GRID_CELLS_PER_DEGREE).astype(np.int32)
+    order = np.lexsort((cell_cols, cell_rows))
+    merged = merged.iloc[order].reset_index(drop=True)
+    cell_rows, cell_cols = cell_rows[order], cell_cols[order]
+    tile_starts = np.flatnonzero(np.diff(cell_rows, prepend=-1) | np.diff(cell_cols, prepend=-1))
+    tile_ends = np.append(tile_starts[1:], len(merged))
+    grid_json = json.dumps({f'{cell_rows[start]},{cell_cols[start]}': [int(start), int(end)]
+                            for start, end in zip(tile_starts, tile_ends)},
+                           separators=(',', ':'))
+
+    # Convert to columnar JSON (one array per field) so keys aren't repeated
+    # per ZIP; 5 decimals is ~1 m, finer than any zoom level shows
+    columns = ['ZCTA5CE20', 'City', 'State', 'lat', 'lon',
+               'color_idx', 'yoy_change', 'latest_price',
+               'population', 'radius', 'search_key']
+    data_json = '{' + ','.join(
+        f'"{col}":{merged[col].to_json(orient="values", double_precision=5)}' for col in columns
+    ) + '}'
 
     # HTML template
     html_content = f"""<!DOCTYPE html>
@@ -367,8 +416,37 @@ def create_yoy_html_map(merged, latest_date, year_ago_date):
     </div>
 
     <script>
-        // Load data
-        const zipData = {data_json};
+        // ZIP data (one array per field) and its 0.5° tile index
+        // ("row,col" -> zipData indices), filled from the gzipped sidecar file
+        let zipData = {{}};
+        let zipCount = 0;
+        let zipGrid = {{}};
+        const GRID_CELLS_PER_DEGREE = {GRID_CELLS_PER_DEGREE};
+
+        // Load data; the sidecar is unpacked here unless the server already
+        // decoded it with Content-Encoding: gzip
+        async function loadZipData() {{
+            const response = await fetch('{DATA_FILE_NAME}');
+            const bytes = new Uint8Array(await response.arrayBuffer());
+            let text;
+            if (bytes[0] === 0x1f && bytes[1] === 0x8b) {{
+                const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+                text = await new Response(stream).text();
+            }} else {{
+                text = new TextDecoder().decode(bytes);
+            }}
+            const payload = JSON.parse(text);
+            zipData = payload.zipData;
+            zipCount = zipData.ZCTA5CE20.length;
+            zipGrid = payload.zipGrid;
+
+            // Numeric fields go into typed arrays for the marker and search loops
+            zipData.lat = Float32Array.from(zipData.lat);
+            zipData.lon = Float32Array.from(zipData.lon);
+            zipData.color_idx = Uint8Array.from(zipData.color_idx);
+            zipData.radius = Float32Array.from(zipData.radius);
+            zipData.population = Int32Array.from(zipData.population);
+        }}
 
         // Initialize map
         const map = L.map('map').setView([39.8283, -98.5795], 4);
@@ -378,58 +456,161 @@ def create_yoy_html_map(merged, latest_date, year_ago_date):
             attribution: '© OpenStreetMap contributors'
         }}).addTo(map);
 
-        // YoY color scale
-        function getColor(change) {{
-            return change > 10  ? '#F4743B' :  // Red for high increases
-                   change > 5   ? '#FEC439' :  // Yellow for moderate increases
-                   change > 0   ? '#67A275' :  // Green for small increases
-                   change > -5  ? '#0BB4FF' :  // Blue for small decreases
-                                  '#3D3733';    // Black for large decreases
+        // YoY color scale, indexed by color_idx:
+        // <=-5% black, <=0% blue, <=5% green, <=10% yellow, >10% red
+        const PALETTE = ['#3D3733', '#0BB4FF', '#67A275', '#FEC439', '#F4743B'];
+
+        // Popup values are formatted here rather than shipped as strings
+        const priceFormat = new Intl.NumberFormat('en-US', {{style: 'currency', currency: 'USD', maximumFractionDigits: 0}});
+
+        // Draw every bubble into one canvas instead of one SVG node per ZIP
+        const renderer = L.canvas({{padding: 0.5}});
+
+        // Markers are only created the first time their tile comes into view
+        let markers = [];
+        const markerLayer = L.layerGroup().addTo(map);
+        let visibleTiles = new Set();
+
+        // ZIP -> index, so an exact ZIP jumps straight to its marker
+        let zipIndex = new Map();
+
+        // Highlight state per ZIP (0 normal, 1 match, 2 dimmed); search only
+        // restyles markers whose state changed, new markers start in theirs
+        const STATE_STYLES = [
+            {{fillOpacity: 0.7, weight: 0.5}},
+            {{fillOpacity: 1, weight: 2}},
+            {{fillOpacity: 0.1, weight: 0.5}}
+        ];
+        let markerState = new Uint8Array(0);
+
+        // One popup shared by every marker; its content is only built for the
+        // ZIP being opened instead of bound to each marker up front
+        const sharedPopup = L.popup();
+        function openZipPopup(i) {{
+            sharedPopup
+                .setLatLng([zipData.lat[i], zipData.lon[i]])
+                .setContent(`
+                    <b>${{zipData.ZCTA5CE20[i]}}</b><br>
+                    ${{zipData.City[i]}}, ${{zipData.State[i]}}<br>
+                    <b>YoY: ${{zipData.yoy_change[i] >= 0 ? '+' : ''}}${{zipData.yoy_change[i].toFixed(1)}}%</b><br>
+                    Current: ${{priceFormat.format(zipData.latest_price[i])}}<br>
+                    Pop: ${{zipData.population[i].toLocaleString()}}
+                `)
+                .openOn(map);
+        }}
+
+        function getMarker(i) {{
+            if (!markers[i]) {{
+                const marker = L.circleMarker([zipData.lat[i], zipData.lon[i]], {{
+                    renderer: renderer,
+                    radius: zipData.radius[i],
+                    fillColor: PALETTE[zipData.color_idx[i]],
+                    color: '#3D3733',
+                    weight: 0.5,
+                    opacity: 1,
+                    fillOpacity: 0.7
+                }});
+                if (markerState[i] !== 0) marker.setStyle(STATE_STYLES[markerState[i]]);
+
+                marker.on('click', () => openZipPopup(i));
+
+                markers[i] = marker;
+            }}
+            return markers[i];
+        }}
+
+        // Add the markers of tiles entering the (padded) view, drop the ones leaving it
+        function updateVisibleTiles() {{
+            const bounds = map.getBounds().pad(0.25);
+            const rowStart = Math.floor(Math.max(bounds.getSouth(), -90) * GRID_CELLS_PER_DEGREE);
+            const rowEnd = Math.floor(Math.min(bounds.getNorth(), 90) * GRID_CELLS_PER_DEGREE);
+            const colStart = Math.floor(Math.max(bounds.getWest(), -180) * GRID_CELLS_PER_DEGREE);
+            const colEnd = Math.floor(Math.min(bounds.getEast(), 180) * GRID_CELLS_PER_DEGREE);
+
+            const tiles = new Set();
+            for (let row = rowStart; row <= rowEnd; row++) {{
+                for (let col = colStart; col <= colEnd; col++) {{
+                    const key = row + ',' + col;
+                    if (zipGrid[key]) tiles.add(key);
+                }}
+            }}
+
+            visibleTiles.forEach(key => {{
+                if (tiles.has(key)) return;
+                const [start, end] = zipGrid[key];
+                for (let i = start; i < end; i++) {{
+                    if (markers[i]) markerLayer.removeLayer(markers[i]);
+                }}
+            }});
+            tiles.forEach(key => {{
+                if (!visibleTiles.has(key)) pendingTiles.push(key);
+            }});
+            visibleTiles = tiles;
+
+            if (!addingTiles) {{
+                addingTiles = true;
+                requestAnimationFrame(addPendingTiles);
+            }}
         }}
 
-        // Create markers
-        const markers = [];
-        zipData.forEach(zip => {{
-            const marker = L.circleMarker([zip.lat, zip.lon], {{
-                radius: Math.min(zip.bubble_size, 20),
-                fillColor: getColor(zip.yoy_change),
-                color: '#3D3733',
-                weight: 0.5,
-                opacity: 1,
-                fillOpacity: 0.7
-            }}).addTo(map);
-
-            marker.bindPopup(`
-                <b>${{zip.ZCTA5CE20}}</b><br>
-                ${{zip.City}}, ${{zip.State}}<br>
-                <b>YoY: ${{zip.yoy_display}}</b><br>
-                Current: ${{zip.price_display}}<br>
-                Pop: ${{zip.population.toLocaleString()}}
-            `);
-
-            markers.push({{marker: marker, data: zip}});
+        // Tiles entering the view are added in ~50 ms slices per frame (like
+        // markercluster's chunkedLoading), so zooming out never freezes the page
+        let pendingTiles = [];
+        let addingTiles = false;
+        function addPendingTiles() {{
+            const frameStart = performance.now();
+            while (pendingTiles.length > 0 && performance.now() - frameStart < 50) {{
+                const key = pendingTiles.shift();
+                if (!visibleTiles.has(key)) continue;
+                const [start, end] = zipGrid[key];
+                for (let i = start; i < end; i++) markerLayer.addLayer(getMarker(i));
+            }}
+
+            if (pendingTiles.length > 0) {{
+                requestAnimationFrame(addPendingTiles);
+            }} else {{
+                addingTiles = false;
+            }}
+        }}
+
+        map.on('moveend', updateVisibleTiles);
+
+        // Build the lookups and draw the first view once the data is in
+        loadZipData().then(() => {{
+            markers = new Array(zipCount);
+            zipIndex = new Map(zipData.ZCTA5CE20.map((zip, i) => [zip, i]));
+            markerState = new Uint8Array(zipCount);
+            updateVisibleTiles();
         }});
 
-        // Search functionality
+        // Search functionality, debounced so bursts of keystrokes run one pass
+        let searchTimeout = null;
         document.getElementById('searchInput').addEventListener('input', function(e) {{
             const searchTerm = e.target.value.toLowerCase();
 
-            markers.forEach(item => {{
-                const matches = item.data.ZCTA5CE20.includes(searchTerm) ||
-                              item.data.City.toLowerCase().includes(searchTerm);
+            clearTimeout(searchTimeout);
+            searchTimeout = setTimeout(() => {{
+                for (let i = 0; i < zipCount; i++) {{
+                    let state = 0;
+                    if (searchTerm.length > 0) {{
+                        state = zipData.search_key[i].includes(searchTerm) ? 1 : 2;
+                    }}
 
-                if (matches && searchTerm.length > 0) {{
-                    item.marker.setStyle({{fillOpacity: 1, weight: 2}});
-                    if (searchTerm.length === 5 && item.data.ZCTA5CE20 === searchTerm) {{
-                        map.setView([item.data.lat, item.data.lon], 10);
-                        item.marker.openPopup();
+                    if (state !== markerState[i]) {{
+                        markerState[i] = state;
+                        if (markers[i]) markers[i].setStyle(STATE_STYLES[state]);
                     }}
-                }} else if (searchTerm.length === 0) {{
-                    item.marker.setStyle({{fillOpacity: 0.7, weight: 0.5}});
-                }} else {{
-                    item.marker.setStyle({{fillOpacity: 0.1, weight: 0.5}});
                 }}
-            }});
+
+                if (searchTerm.length === 5) {{
+                    const i = zipIndex.get(searchTerm);
+                    if (i !== undefined) {{
+                        map.setView([zipData.lat[i], zipData.lon[i]], 10);
+                        markerLayer.addLayer(getMarker(i));
+                        openZipPopup(i);
+                    }}
+                }}
+            }}, 100);
         }});
     </script>
 </body>
@@ -443,8 +624,20 @@ def create_yoy_html_map(merged, latest_date, year_ago_date):
     with open(output_file, 'w') as f:
         f.write(html_content)
 
+    # The data ships as a gzipped sidecar so the page shell stays small and
+    # browsers can cache it separately from the monthly data
+    data_file = OUTPUT_DIR / DATA_FILE_NAME
+    payload = f'{{"zipData":{data_json},"zipGrid":{grid_json}}}'
+    data_file.write_bytes(gzip.compress(payload.encode('utf-8'), compresslevel=9))
+
+    # Pre-compressed copy for hosts that can serve it with Content-Encoding: gzip
+    gz_file = output_file.with_suffix('.html.gz')
+    gz_file.write_bytes(gzip.compress(html_content.encode('utf-8'), compresslevel=9))
+
     print(f"✅ YoY map saved to {output_file}")
-    print(f"📊 File size: {output_file.stat().st_size / 1024 / 1024:.1f} MB")
+    print(f"📊 File size: {output_file.stat().st_size / 1024:.1f} KB "
+          f"({gz_file.stat().st_size / 1024:.1f} KB gzipped), "
+          f"data {data_file.stat().st_size / 1024 / 1024:.1f} MB gzipped")
 
 def main():
     """Main function"""
@@ -6,9 +6,11 @@ import requests
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+from email.utils import formatdate
 
 ZILLOW_URL = "https://files.zillowstatic.com/research/public_csvs/zhvi/Zip_zhvi_uc_sfrcondo_tier_0.33_0.67_sm_sa_month.csv"
 OUTPUT_DIR = Path(__file__).parent.parent / "data"
+CHUNK_BYTES = 1 << 20
 
 def download_zillow_data():
     """Download the latest Zillow data"""
@@ -18,15 +20,24 @@ def download_zillow_data():
     output_file = OUTPUT_DIR / "ZillowZip.csv"
 
     try:
-        # Download the file
-        response = requests.get(ZILLOW_URL, timeout=60)
-        response.raise_for_status()
-
-        # Save to file
-        with open(output_file, 'wb') as f:
-            f.write(response.content)
-
-        print(f"✓ Downloaded to {output_file}")
+        # Only fetch the body if Zillow's file changed since our copy was written
+        request_headers = {}
+        if output_file.exists():
+            request_headers['If-Modified-Since'] = formatdate(output_file.stat().st_mtime, usegmt=True)
+
+        # Stream to a temporary file a chunk at a time instead of holding the
+        # whole CSV in memory; it only replaces the old copy once complete
+        with requests.get(ZILLOW_URL, headers=request_headers, stream=True, timeout=60) as response:
+            if response.status_code == 304:
+                print(f"✓ {output_file} is already up to date")
+            else:
+                response.raise_for_status()
+                partial_file = output_file.with_suffix('.csv.part')
+                with open(partial_file, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_BYTES):
+                        f.write(chunk)
+                partial_file.replace(output_file)
+                print(f"✓ Downloaded to {output_file}")
 
         # Verify the data
         df = pd.read_csv(output_file)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Year-over-year helpers shared by the map scripts
+Picks the comparison month from the Zillow header and computes the price
+change with its outlier mask on the raw arrays
+"""
+import numpy as np
+import pandas as pd
+
+def find_year_ago_column(date_columns):
+    """Date column for the same month a year before the latest one, else the
+    closest month from that year; None if there is no data from last year"""
+    # Parse all date columns in one call; anything that isn't a date becomes NaT
+    dates = pd.to_datetime(pd.Series(date_columns), format='%Y-%m-%d', errors='coerce')
+    latest = dates.iloc[-1]
+
+    month_gap = (dates.dt.month - latest.month).abs().where(dates.dt.year == latest.year - 1)
+    return date_columns[month_gap.idxmin()] if month_gap.notna().any() else None
+
+def price_change_pct(latest_prices, year_ago_prices, lower=-50, upper=100, inclusive=False):
+    """Percent change between two price arrays and the mask of rows to keep
+
+    Missing prices come out as NaN and are dropped by the same mask as the
+    outliers outside (lower, upper), or [lower, upper] when ``inclusive``.
+    Returns (pct, keep).
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pct = (latest_prices - year_ago_prices) / year_ago_prices * 100
+    if inclusive:
+        in_range = (pct >= lower) & (pct <= upper)
+    else:
+        in_range = (pct > lower) & (pct < upper)
+    return pct, np.isfinite(pct) & in_range